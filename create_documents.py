@@ -7,15 +7,89 @@ This script reads markdown files from the content/ directory and generates:
 - script_mentor.pdf (with fillable form fields)
 - skill_assessment.pdf (with rating squares and target circles)
 
-Output files are saved to the outputs/ directory.
+Output files are saved to the outputs/ directory. Compiled PDFs are also
+kept in .cache/, keyed by their source content, so that unchanged documents
+are not recompiled on the next run. Only the PDFs of the latest sources are
+kept there.
 """
 
-import os
 import sys
+import shutil
+import hashlib
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 import endoy
 
 
+@dataclass
+class PdfJob:
+    """
+    Paths and settings for one generated document, resolved once in main().
+
+    Attributes:
+        source: Markdown source file
+        role: 'Mentee' or 'Mentor' for meeting scripts, None for the skills assessment
+        tex: Path for the .tex source
+        pdf: Output PDF path
+        cached_pdf: Location of the PDF in the cache
+        keep_tex: Keep the .tex file after a successful compilation
+    """
+    source: Path
+    role: Optional[str]
+    tex: Path
+    pdf: Path
+    cached_pdf: Path
+    keep_tex: bool = False
+
+
+def _cache_key(md_path: Path, variant: str, tex_version: str) -> str:
+    """
+    Compute the PDF cache key for a document.
+
+    The key covers the markdown source, the document variant (e.g. the role),
+    the source of the endoy library and the pdflatex version, so that changes
+    to the generator or a TeX upgrade also invalidate previously cached PDFs.
+
+    Args:
+        md_path: Path to the markdown source
+        variant: Name distinguishing documents built from the same source
+        tex_version: pdflatex version banner, see endoy.pdflatex_version()
+
+    Returns:
+        Hex digest identifying the document
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(md_path.read_bytes())
+    h.update(variant.encode('utf-8'))
+    h.update(Path(endoy.__file__).read_bytes())
+    h.update(tex_version.encode('utf-8'))
+    return h.hexdigest()
+
+
+def _build(job: PdfJob) -> bool:
+    """
+    Compile a document's LaTeX source to PDF.
+
+    compile_latex_to_pdf runs pdflatex in its own scratch directory, so
+    several documents can be built concurrently. Unless the job keeps it,
+    the .tex file is removed on success. It is left in place for inspection
+    on failure.
+
+    Args:
+        job: Document to build, whose .tex file has been written
+
+    Returns:
+        True if successful, False otherwise
+    """
+    success = endoy.compile_latex_to_pdf(str(job.tex), str(job.pdf))
+    if success and not job.keep_tex:
+        job.tex.unlink()
+    return success
+
+
 def main():
     """
     Main function to generate all meeting documents.
@@ -24,130 +98,129 @@ def main():
     - script.md -> outputs/script_mentee.pdf (Mentee role with form fields)
     - script.md -> outputs/script_mentor.pdf (Mentor role with form fields)
     - skills.md -> outputs/skill_assessment.pdf
+
+    Documents whose sources are unchanged are copied from .cache/. The
+    remaining documents are compiled to PDF concurrently, since the pdflatex
+    runs are independent of each other.
     """
     # Define paths
     content_dir = Path('content')
     output_dir = Path('outputs')
+    cache_dir = Path('.cache')
 
-    # Ensure output directory exists
+    # Ensure output and cache directories exist
     output_dir.mkdir(exist_ok=True)
+    cache_dir.mkdir(exist_ok=True)
 
     print("=" * 60)
     print("Generating end-of-year meeting documents...")
     print("=" * 60)
 
-    # ========================================================================
-    # Parse script.md (used for both mentee and mentor PDFs)
-    # ========================================================================
     script_md = content_dir / 'script.md'
-    if not script_md.exists():
-        print(f"  ERROR: {script_md} not found")
-        sys.exit(1)
-
-    script_data = endoy.parse_markdown_file(str(script_md))
-
-    # ========================================================================
-    # Generate script_mentee.pdf
-    # ========================================================================
-    try:
-        print("\n[1/3] Generating script_mentee.pdf...")
-
-        mentee_latex = endoy.generate_latex_script(script_data, role='Mentee')
-
-        # Save LaTeX to temporary file
-        tex_output = output_dir / 'script_mentee.tex'
-        endoy.save_latex_file(mentee_latex, str(tex_output))
-
-        # Compile to PDF
-        mentee_output = output_dir / 'script_mentee.pdf'
-        print(f"  → Compiling LaTeX to PDF...")
-
-        success = endoy.compile_latex_to_pdf(str(tex_output), str(mentee_output))
-
-        if success:
-            print(f"  ✓ Generated: {mentee_output}")
-            tex_output.unlink()
-        else:
-            print(f"  ERROR: Failed to compile PDF")
-            print(f"  LaTeX source saved at: {tex_output}")
+    skills_md = content_dir / 'skills.md'
+    for md_file in (script_md, skills_md):
+        if not md_file.exists():
+            print(f"  ERROR: {md_file} not found")
             sys.exit(1)
 
-    except Exception as e:
-        print(f"  ERROR generating script_mentee.pdf: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
-
-    # ========================================================================
-    # Generate script_mentor.pdf
-    # ========================================================================
     try:
-        print("\n[2/3] Generating script_mentor.pdf...")
-
-        mentor_latex = endoy.generate_latex_script(script_data, role='Mentor')
-
-        # Save LaTeX to temporary file
-        tex_output = output_dir / 'script_mentor.tex'
-        endoy.save_latex_file(mentor_latex, str(tex_output))
-
-        # Compile to PDF
-        mentor_output = output_dir / 'script_mentor.pdf'
-        print(f"  → Compiling LaTeX to PDF...")
-
-        success = endoy.compile_latex_to_pdf(str(tex_output), str(mentor_output))
-
-        if success:
-            print(f"  ✓ Generated: {mentor_output}")
-            tex_output.unlink()
-        else:
-            print(f"  ERROR: Failed to compile PDF")
-            print(f"  LaTeX source saved at: {tex_output}")
-            sys.exit(1)
-
-    except Exception as e:
-        print(f"  ERROR generating script_mentor.pdf: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
+        tex_version = endoy.pdflatex_version()
+    except (OSError, subprocess.SubprocessError):
+        tex_version = ''  # Compiling reports the missing pdflatex
+
+    # Resolve all paths once: (output name, markdown source, role). The
+    # skills assessment source is kept next to its PDF.
+    jobs = [
+        PdfJob(
+            source=md_file,
+            role=role,
+            tex=output_dir / f'{name}.tex',
+            pdf=output_dir / f'{name}.pdf',
+            cached_pdf=cache_dir / f'{_cache_key(md_file, name, tex_version)}.pdf',
+            keep_tex=role is None,
+        )
+        for name, md_file, role in (
+            ('script_mentee', script_md, 'Mentee'),
+            ('script_mentor', script_md, 'Mentor'),
+            ('skill_assessment', skills_md, None),
+        )
+    ]
 
     # ========================================================================
-    # Generate skill_assessment.pdf (via LaTeX)
+    # Reuse cached PDFs, and generate and compile the rest. Each document is
+    # submitted for compilation as soon as its LaTeX is ready, so generating
+    # the next document overlaps with compiling the previous ones.
     # ========================================================================
-    try:
-        print("\n[3/3] Generating skill_assessment.pdf...")
-        skills_md = content_dir / 'skills.md'
-
-        if not skills_md.exists():
-            print(f"  ERROR: {skills_md} not found")
-            sys.exit(1)
-
-        skills_data = endoy.parse_markdown_file(str(skills_md))
-        skills_latex = endoy.generate_latex_skills(skills_data)
-
-        # Save LaTeX to temporary file
-        tex_output = output_dir / 'skill_assessment.tex'
-        endoy.save_latex_file(skills_latex, str(tex_output))
-        print(f"  ✓ Generated LaTeX: {tex_output}")
-
-        # Compile to PDF
-        pdf_output = output_dir / 'skill_assessment.pdf'
-        print(f"  → Compiling LaTeX to PDF...")
-
-        success = endoy.compile_latex_to_pdf(str(tex_output), str(pdf_output))
-
-        if success:
-            print(f"  ✓ Generated: {pdf_output}")
-            # Clean up .tex file
-            #tex_output.unlink()
-        else:
-            print(f"  ERROR: Failed to compile PDF")
-            print(f"  LaTeX source saved at: {tex_output}")
+    failed = False
+    with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+        futures = {}
+        try:
+            print("\nGenerating LaTeX sources...")
+
+            script_ir = None
+            for job in jobs:
+                cached = job.cached_pdf.exists()
+                if cached:
+                    shutil.copy(job.cached_pdf, job.pdf)
+                    try:
+                        job.cached_pdf.touch()  # Mark as recently used
+                    except OSError:
+                        pass
+                    print(f"  ✓ Unchanged, reused cached PDF: {job.pdf}")
+                    # A kept .tex file is written even when the PDF is reused
+                    if not job.keep_tex:
+                        continue
+
+                # The LaTeX is streamed straight into the .tex file
+                if job.role is None:
+                    skills_data = endoy.parse_markdown_file(str(job.source))
+                    with endoy.open_latex_file(str(job.tex)) as out:
+                        endoy.generate_latex_skills(skills_data, out)
+                else:
+                    # script.md is parsed and prepared once for both roles
+                    if script_ir is None:
+                        script_data = endoy.parse_markdown_file(str(job.source))
+                        script_ir = endoy.build_script_ir(script_data)
+                    with endoy.open_latex_file(str(job.tex)) as out:
+                        endoy.render_latex_script(script_ir, role=job.role, out=out)
+                if job.keep_tex:
+                    print(f"  ✓ Generated LaTeX: {job.tex}")
+                if cached:
+                    continue
+
+                print(f"  → Compiling {job.pdf.name}...")
+                futures[executor.submit(_build, job)] = job
+
+        except Exception as e:
+            print(f"  ERROR generating LaTeX sources: {e}")
+            import traceback
+            traceback.print_exc()
             sys.exit(1)
 
-    except Exception as e:
-        print(f"  ERROR generating skill_assessment.pdf: {e}")
-        import traceback
-        traceback.print_exc()
+        for done, future in enumerate(as_completed(futures), start=1):
+            job = futures[future]
+            try:
+                success = future.result()
+            except Exception as e:
+                print(f"  ERROR generating {job.pdf.name}: {e}")
+                failed = True
+                continue
+
+            if success:
+                # Only the PDFs of the current sources are kept; caching is
+                # best effort
+                try:
+                    endoy._publish_to_cache(str(job.pdf), job.cached_pdf)
+                    endoy._prune_cache(cache_dir, '*.pdf', len(jobs))
+                except OSError as e:
+                    print(f"  Warning: could not cache {job.pdf.name}: {e}")
+                print(f"  [{done}/{len(futures)}] ✓ Generated: {job.pdf}")
+            else:
+                print(f"  [{done}/{len(futures)}] ERROR: Failed to compile {job.pdf.name}")
+                print(f"  LaTeX source saved at: {job.tex}")
+                failed = True
+
+    if failed:
         sys.exit(1)
 
     # ========================================================================
@@ -157,11 +230,10 @@ def main():
     print("✓ All documents generated successfully!")
     print("=" * 60)
     print(f"\nOutput files:")
-    print(f"  - {output_dir / 'script_mentee.pdf'}")
-    print(f"  - {output_dir / 'script_mentor.pdf'}")
-    print(f"  - {output_dir / 'skill_assessment.pdf'}")
+    for job in jobs:
+        print(f"  - {job.pdf}")
     print()
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
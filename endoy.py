@@ -5,17 +5,32 @@ This library reads markdown content files and generates PDF documents
 with fillable form fields for academic mentor/mentee end-of-year meetings.
 """
 
+import io
 import re
+import functools
+import hashlib
 import subprocess
 import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, TextIO, Tuple
 
 
 # ============================================================================
 # Markdown Parsing Functions
 # ============================================================================
 
+# Matches header lines ('# ', '## ', '### ') and bullet points ('- ') with
+# non-blank text. Other lines, including deeper headers, do not match.
+_LINE_RE = re.compile(
+    r'^(?:(#{1,3}) [^\S\n]*(\S.*)|- [^\S\n]*(\S.*))',
+    re.MULTILINE
+)
+
+
 def parse_markdown(markdown_content: str) -> Dict[str, Any]:
     """
     Parse markdown content and extract title, sections, subsections, and bullet points.
@@ -42,68 +57,53 @@ def parse_markdown(markdown_content: str) -> Dict[str, Any]:
             ]
         }
     """
-    lines = markdown_content.strip().split('\n')
     result = {
         'title': '',
         'sections': []
     }
 
-    current_section = None
-    current_subsection = None
+    # Sections and subsections are attached to their parent as soon as they
+    # start, and bullets go straight into the list they belong to, so the
+    # loop needs no bookkeeping to close them. The bound append methods are
+    # kept in locals to avoid lookups on every line.
+    append_section = result['sections'].append
+    append_subsection = None
+    append_item = None
 
-    for line in lines:
-        line = line.rstrip()
+    # Only header and bullet lines match; everything else is skipped by the scanner
+    for match in _LINE_RE.finditer(markdown_content.strip()):
+        hashes, header_text, item_text = match.groups()
+
+        # Match bullet point (- Item), added to the current subsection, or
+        # directly to the current section (for simple structures like skills.md)
+        if hashes is None:
+            if append_item is not None:
+                append_item(item_text.rstrip())
 
         # Match H1 header (# Title)
-        if line.startswith('# '):
-            result['title'] = line[2:].strip()
+        elif hashes == '#':
+            result['title'] = header_text.rstrip()
 
         # Match H2 header (## Section)
-        elif line.startswith('## '):
-            # Save previous subsection to previous section if exists
-            if current_subsection is not None and current_section is not None:
-                current_section['subsections'].append(current_subsection)
-
-            # Save previous section if exists
-            if current_section is not None:
-                result['sections'].append(current_section)
-
-            # Start new section
-            current_section = {
-                'header': line[3:].strip(),
-                'subsections': [],
-                'items': []  # Support direct items under section
-            }
-            current_subsection = None
+        elif hashes == '##':
+            items = []  # Support direct items under section
+            subsections = []
+            append_section({
+                'header': header_text.rstrip(),
+                'subsections': subsections,
+                'items': items
+            })
+            append_subsection = subsections.append
+            append_item = items.append
 
         # Match H3 header (### Mentee/Mentor/Both/Both*)
-        elif line.startswith('### '):
-            if current_section is not None:
-                # Save previous subsection if exists
-                if current_subsection is not None:
-                    current_section['subsections'].append(current_subsection)
-
-                # Start new subsection
-                current_subsection = {
-                    'header': line[4:].strip(),
-                    'items': []
-                }
-
-        # Match bullet point (- Item)
-        elif line.startswith('- '):
-            item_text = line[2:].strip()
-            if current_subsection is not None:
-                # Add to current subsection
-                current_subsection['items'].append(item_text)
-            elif current_section is not None:
-                # Add directly to current section (for simple structures like skills.md)
-                current_section['items'].append(item_text)
-
-    # Add last subsection and section if they exist
-    if current_subsection is not None and current_section is not None:
-        current_section['subsections'].append(current_subsection)
-    if current_section is not None:
-        result['sections'].append(current_section)
+        elif append_subsection is not None:
+            items = []
+            append_subsection({
+                'header': header_text.rstrip(),
+                'items': items
+            })
+            append_item = items.append
 
     return result
 
@@ -112,22 +112,50 @@ def parse_markdown_file(file_path: str) -> Dict[str, Any]:
     """
     Parse a markdown file from disk.
 
+    Results are cached and reused for as long as the file's modification
+    time and size are unchanged. The returned structure is shared between
+    calls and must not be modified.
+
     Args:
         file_path: Path to markdown file
 
     Returns:
         Parsed markdown structure (see parse_markdown)
     """
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    st = os.stat(file_path)
+    return _parse_markdown_file_cached(file_path, st.st_mtime_ns, st.st_size)
 
-    return parse_markdown(content)
+
+@functools.lru_cache(maxsize=64)
+def _parse_markdown_file_cached(file_path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """
+    Read and parse a markdown file, memoized by path, mtime and size.
+
+    Args:
+        file_path: Path to markdown file
+        mtime_ns: Modification time of the file, part of the cache key
+        size: Size of the file, part of the cache key
+
+    Returns:
+        Parsed markdown structure (see parse_markdown)
+    """
+    # One read and one decode; the parser copes with \r\n line endings itself
+    return parse_markdown(Path(file_path).read_bytes().decode('utf-8'))
 
 
 # ============================================================================
 # RTF Generation Functions
 # ============================================================================
 
+# RTF special characters that need escaping, replaced in a single pass
+_RTF_ESCAPES = {
+    '\\': '\\\\',
+    '{': '\\{',
+    '}': '\\}',
+}
+_RTF_SPECIALS_RE = re.compile('[' + re.escape(''.join(_RTF_ESCAPES)) + ']')
+
+
 def escape_rtf(text: str) -> str:
     """
     Escape special characters for RTF format.
@@ -138,192 +166,261 @@ def escape_rtf(text: str) -> str:
     Returns:
         RTF-escaped string
     """
-    # RTF special characters that need escaping
-    replacements = {
-        '\\': '\\\\',
-        '{': '\\{',
-        '}': '\\}',
-    }
+    # Most text has nothing to escape
+    if _RTF_SPECIALS_RE.search(text) is None:
+        return text
+
+    return _RTF_SPECIALS_RE.sub(lambda m: _RTF_ESCAPES[m.group()], text)
+
+
+# Preamble of the meeting scripts
+_SCRIPT_PREAMBLE = (
+    r'\documentclass[9pt,a4paper]{article}' '\n'
+    r'\usepackage[margin=1in]{geometry}' '\n'
+    r'\usepackage{hyperref}' '\n'
+    r'\usepackage{xcolor}' '\n'
+    r'\usepackage{needspace}' '\n'
+    '\n'
+    r'% Configure form field appearance' '\n'
+    r'\hypersetup{' '\n'
+    r'    pdfborder={0 0 0}' '\n'
+    r'}' '\n'
+    '\n'
+    r'\begin{document}' '\n'
+    '\n'
+)
+
+# Title of the meeting scripts, followed by the role
+_TITLE_TMPL = (
+    r'\begin{{center}}' '\n'
+    r'{{\Large\bfseries {title} ({role})}}' '\n'
+    r'\end{{center}}' '\n'
+    '\n'
+    r'\vspace{{0.5cm}}' '\n'
+    '\n'
+)
+
+# Instructions at the top of the meeting scripts
+_SCRIPT_INSTRUCTIONS_TMPL = (
+    r'\noindent\textbf{{Instructions:}}' '\n'
+    '\n'
+    r'\vspace{{0.2cm}}' '\n'
+    '\n'
+    r'\noindent This script is designed to help you prepare for and guide your end-of-year meeting. Questions in black are meant for you to answer and have fillable text fields. Questions in gray (prefixed with ``{other_role}:'') are for the other person and are provided for your reference. Items in italics are instructions or actions to be completed.' '\n'
+    '\n'
+    r'\vspace{{0.2cm}}' '\n'
+    '\n'
+    r'\noindent\textbf{{Preparation:}} Please complete this form \textit{{before}} the meeting. Thoughtful preparation is essential---take time to reflect deeply on each question. Your honest, considered responses will make the meeting more productive and meaningful for both parties.' '\n'
+    '\n'
+    r'\vspace{{0.5cm}}' '\n'
+    '\n'
+)
+
+# Script building blocks, written with a single format call each.
+# Section header (H2) - kept together with its content
+_SECTION_TMPL = (
+    r'\needspace{{6cm}}' '\n'
+    r'\noindent\textbf{{\large {header}}}' '\n'
+    '\n'
+    r'\vspace{{0.3cm}}' '\n'
+    '\n'
+)
+
+# Question with a multi-line text field, kept together on one page
+_QUESTION_TMPL = (
+    r'\needspace{{4cm}}' '\n'
+    '{label}\n'
+    '\n'
+    r'\vspace{{0.3em}}' '\n'
+    r'\noindent\TextField[name={name},multiline=true,width=\textwidth,height=2.5cm,bordercolor={{0 0 0}},backgroundcolor={{0.95 0.95 0.95}}]{{}}' '\n'
+    '\n'
+    r'\vspace{{{skip}}}' '\n'
+    '\n'
+)
+
+# Action or instruction, shown in italics without a field
+_ACTION_TMPL = (
+    r'\noindent\textit{{{text}}}' '\n'
+    '\n'
+    r'\vspace{{0.3cm}}' '\n'
+    '\n'
+)
+
+# The other role's question, shown in gray without a field
+_OTHER_ROLE_TMPL = (
+    r'\noindent{{\color{{gray}}{role}: {text}}}' '\n'
+    '\n'
+    r'\vspace{{0.15cm}}' '\n'
+    '\n'
+)
+
+
+def _split_action(item: str) -> Tuple[bool, str]:
+    """
+    Split an item into its action flag and clean text in a single pass.
 
-    result = text
-    for char, escaped in replacements.items():
-        result = result.replace(char, escaped)
+    Items ending with * are actions and get no form field.
 
-    return result
+    Args:
+        item: Raw item text from the parsed markdown
 
+    Returns:
+        (is_action, text) with trailing stars and whitespace removed
+    """
+    text = item.rstrip('*')
+    return len(text) != len(item), text.strip()
 
-def generate_latex_script(parsed_data: Dict[str, Any], role: str = 'Mentee') -> str:
+
+def build_script_ir(parsed_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the role-independent representation of a meeting script.
+
+    All text is escaped and every item is classified once here, so that
+    rendering the script for several roles only has to emit the parts that
+    differ between them (form fields and gray labels).
+
+    Args:
+        parsed_data: Output from parse_markdown()
+
+    Returns:
+        Dictionary with structure:
+        {
+            'title': str,  # LaTeX-escaped
+            'sections': [
+                (header, [(owner, text, is_action), ...]),
+                ...
+            ]
+        }
+        where header and text are LaTeX-escaped, owner is 'Mentee',
+        'Mentor' or 'Both', and is_action marks instructions that get no
+        form field. Items under a header ending with * are stored as
+        actions owned by 'Both', since they are shown to everyone.
+    """
+    sections = []
+    for section in parsed_data['sections']:
+        items = []
+
+        # Process subsections (H3: Mentee/Mentor/Both/Both*/Mentee*/Mentor*)
+        for subsection in section['subsections']:
+            subsection_header = subsection['header']
+
+            # Check if header ends with * (action/instruction)
+            header_is_action = subsection_header.endswith('*')
+            header_base = subsection_header.rstrip('*')
+
+            if header_is_action:
+                owner = 'Both'
+            elif header_base in ('Mentee', 'Mentor', 'Both'):
+                owner = header_base
+            else:
+                continue
+
+            for item in subsection['items']:
+                item_is_action, text = _split_action(item)
+                items.append((owner, escape_latex(text), header_is_action or item_is_action))
+
+        sections.append((escape_latex(section['header']), items))
+
+    return {
+        'title': escape_latex(parsed_data['title']),
+        'sections': sections,
+    }
+
+
+def generate_latex_script(parsed_data: Dict[str, Any], role: str = 'Mentee',
+                          out: Optional[TextIO] = None) -> Optional[str]:
     """
     Generate LaTeX document for script with fillable form fields based on role.
 
     Args:
         parsed_data: Output from parse_markdown()
         role: 'Mentee' or 'Mentor' - determines which questions get form fields
+        out: Optional text stream to write the document to. If omitted, the
+            document is built in memory and returned.
 
     Returns:
-        LaTeX document as string
-    """
-    latex_lines = [
-        r'\documentclass[9pt,a4paper]{article}',
-        r'\usepackage[margin=1in]{geometry}',
-        r'\usepackage{hyperref}',
-        r'\usepackage{xcolor}',
-        r'\usepackage{needspace}',
-        r'',
-        r'% Configure form field appearance',
-        r'\hypersetup{',
-        r'    pdfborder={0 0 0}',
-        r'}',
-        r'',
-        r'\begin{document}',
-        r'',
-    ]
+        LaTeX document as string, or None if it was written to out
+    """
+    return render_latex_script(build_script_ir(parsed_data), role, out)
+
+
+def render_latex_script(script_ir: Dict[str, Any], role: str = 'Mentee',
+                        out: Optional[TextIO] = None) -> Optional[str]:
+    """
+    Render a prepared script as LaTeX with fillable form fields based on role.
+
+    Use this instead of generate_latex_script() when generating the script
+    for several roles, so that the role-independent work is done only once.
+
+    Args:
+        script_ir: Output from build_script_ir()
+        role: 'Mentee' or 'Mentor' - determines which questions get form fields
+        out: Optional text stream to write the document to. If omitted, the
+            document is built in memory and returned.
+
+    Returns:
+        LaTeX document as string, or None if it was written to out
+    """
+    if out is None:
+        buffer = io.StringIO()
+        render_latex_script(script_ir, role, buffer)
+        return buffer.getvalue()
+
+    w = out.write
+    other_role = 'Mentor' if role == 'Mentee' else 'Mentee'
+
+    w(_SCRIPT_PREAMBLE)
 
     # Add title with role
-    if parsed_data['title']:
-        title = escape_latex(parsed_data['title'])
-        latex_lines.append(r'\begin{center}')
-        latex_lines.append(r'{\Large\bfseries ' + title + r' (' + role + r')}')
-        latex_lines.append(r'\end{center}')
-        latex_lines.append(r'')
-        latex_lines.append(r'\vspace{0.5cm}')
-        latex_lines.append(r'')
+    if script_ir['title']:
+        w(_TITLE_TMPL.format(title=script_ir['title'], role=role))
 
     # Add instructions
-    latex_lines.append(r'\noindent\textbf{Instructions:}')
-    latex_lines.append(r'')
-    latex_lines.append(r'\vspace{0.2cm}')
-    latex_lines.append(r'')
-    latex_lines.append(r'\noindent This script is designed to help you prepare for and guide your end-of-year meeting. Questions in black are meant for you to answer and have fillable text fields. Questions in gray (prefixed with ``' + ('Mentor' if role == 'Mentee' else 'Mentee') + r':'') are for the other person and are provided for your reference. Items in italics are instructions or actions to be completed.')
-    latex_lines.append(r'')
-    latex_lines.append(r'\vspace{0.2cm}')
-    latex_lines.append(r'')
-    latex_lines.append(r'\noindent\textbf{Preparation:} Please complete this form \textit{before} the meeting. Thoughtful preparation is essential---take time to reflect deeply on each question. Your honest, considered responses will make the meeting more productive and meaningful for both parties.')
-    latex_lines.append(r'')
-    latex_lines.append(r'\vspace{0.5cm}')
-    latex_lines.append(r'')
+    w(_SCRIPT_INSTRUCTIONS_TMPL.format(other_role=other_role))
 
     field_counter = 1
 
     # Add sections
-    for section in parsed_data['sections']:
+    for header, items in script_ir['sections']:
         # Section header (H2) - keep with content
-        header = escape_latex(section['header'])
-        latex_lines.append(r'\needspace{6cm}')
-        latex_lines.append(r'\noindent\textbf{\large ' + header + r'}')
-        latex_lines.append(r'')
-        latex_lines.append(r'\vspace{0.3cm}')
-        latex_lines.append(r'')
+        w(_SECTION_TMPL.format(header=header))
 
-        # Process subsections (H3: Mentee/Mentor/Both/Both*/Mentee*/Mentor*)
-        for subsection in section['subsections']:
-            subsection_header = subsection['header']
+        for owner, item_text, is_action in items:
+            # For other role's items: show in gray without form fields
+            if owner != role and owner != 'Both':
+                w(_OTHER_ROLE_TMPL.format(role=other_role, text=item_text))
 
-            # Check if header ends with * (action/instruction)
-            header_is_action = subsection_header.endswith('*')
-            header_base = subsection_header.rstrip('*')
-
-            # Determine subsection type
-            is_both = header_base == 'Both'
-            is_my_role = header_base == role
-            is_other_role = header_base in ['Mentee', 'Mentor'] and not is_my_role and not is_both
-
-            # For headers ending with * (actions/instructions for everyone in that category)
-            if header_is_action:
-                for item in subsection['items']:
-                    item_text = escape_latex(item.rstrip('*').strip())
-                    latex_lines.append(r'\noindent\textit{' + item_text + r'}')
-                    latex_lines.append(r'')
-                    latex_lines.append(r'\vspace{0.3cm}')
-                    latex_lines.append(r'')
+            # Action items - show in italics, no field
+            elif is_action:
+                w(_ACTION_TMPL.format(text=item_text))
 
             # For "Both" (questions for both to answer separately)
-            elif is_both:
-                for item in subsection['items']:
-                    # Check if item ends with * (action, no field)
-                    item_is_action = item.endswith('*')
-                    item_text = escape_latex(item.rstrip('*').strip())
-
-                    if item_is_action:
-                        # Action item - show in italics, no fields
-                        latex_lines.append(r'\noindent\textit{' + item_text + r'}')
-                        latex_lines.append(r'')
-                        latex_lines.append(r'\vspace{0.3cm}')
-                        latex_lines.append(r'')
-                    else:
-                        # Question - mentee's field first
-                        field_name = f'field{field_counter}'
-                        field_counter += 1
-
-                        latex_lines.append(r'\needspace{4cm}')
-                        latex_lines.append(r'\noindent ' + item_text)
-                        latex_lines.append(r'')
-                        latex_lines.append(r'\vspace{0.3em}')
-                        latex_lines.append(r'\noindent\TextField[name=' + field_name + r',multiline=true,width=\textwidth,height=2.5cm,bordercolor={0 0 0},backgroundcolor={0.95 0.95 0.95}]{}')
-                        latex_lines.append(r'')
-                        latex_lines.append(r'\vspace{0.2cm}')
-                        latex_lines.append(r'')
-
-                        # Then mentor's field with gray label
-                        other_role = 'Mentor' if role == 'Mentee' else 'Mentee'
-                        field_name = f'field{field_counter}'
-                        field_counter += 1
-
-                        latex_lines.append(r'\needspace{4cm}')
-                        latex_lines.append(r'\noindent{\color{gray}' + other_role + r': ' + item_text + r'}')
-                        latex_lines.append(r'')
-                        latex_lines.append(r'\vspace{0.3em}')
-                        latex_lines.append(r'\noindent\TextField[name=' + field_name + r',multiline=true,width=\textwidth,height=2.5cm,bordercolor={0 0 0},backgroundcolor={0.95 0.95 0.95}]{}')
-                        latex_lines.append(r'')
-                        latex_lines.append(r'\vspace{0.4cm}')
-                        latex_lines.append(r'')
+            elif owner == 'Both':
+                # Own field first, then the other role's field with gray label
+                w(_QUESTION_TMPL.format(
+                    label=rf'\noindent {item_text}',
+                    name=f'field{field_counter}',
+                    skip='0.2cm'
+                ))
+                w(_QUESTION_TMPL.format(
+                    label=rf'\noindent{{\color{{gray}}{other_role}: {item_text}}}',
+                    name=f'field{field_counter + 1}',
+                    skip='0.4cm'
+                ))
+                field_counter += 2
 
             # For my role's questions: show in black with form fields
-            elif is_my_role:
-                for item in subsection['items']:
-                    # Check if item ends with * (action, no field)
-                    item_is_action = item.endswith('*')
-                    item_text = escape_latex(item.rstrip('*').strip())
-
-                    if item_is_action:
-                        # Action item - show in italics, no field
-                        latex_lines.append(r'\noindent\textit{' + item_text + r'}')
-                        latex_lines.append(r'')
-                        latex_lines.append(r'\vspace{0.3cm}')
-                        latex_lines.append(r'')
-                    else:
-                        # Question - show with field
-                        field_name = f'field{field_counter}'
-                        field_counter += 1
-
-                        # Keep question and field together
-                        latex_lines.append(r'\needspace{4cm}')
-                        latex_lines.append(r'\noindent ' + item_text)
-                        latex_lines.append(r'')
-                        latex_lines.append(r'\vspace{0.3em}')
-                        # Multi-line text field
-                        latex_lines.append(r'\noindent\TextField[name=' + field_name + r',multiline=true,width=\textwidth,height=2.5cm,bordercolor={0 0 0},backgroundcolor={0.95 0.95 0.95}]{}')
-                        latex_lines.append(r'')
-                        latex_lines.append(r'\vspace{0.4cm}')
-                        latex_lines.append(r'')
-
-            # For other role's questions: show in gray without form fields
-            elif is_other_role:
-                # Determine the other role's name for the label
-                other_role = 'Mentor' if role == 'Mentee' else 'Mentee'
-                for item in subsection['items']:
-                    item_text = escape_latex(item.rstrip('*').strip())
-                    latex_lines.append(r'\noindent{\color{gray}' + other_role + r': ' + item_text + r'}')
-                    latex_lines.append(r'')
-                    latex_lines.append(r'\vspace{0.15cm}')
-                    latex_lines.append(r'')
-
-        latex_lines.append(r'\vspace{0.3cm}')
-        latex_lines.append(r'')
-
-    latex_lines.append(r'\end{document}')
-
-    return '\n'.join(latex_lines)
+            else:
+                w(_QUESTION_TMPL.format(
+                    label=rf'\noindent {item_text}',
+                    name=f'field{field_counter}',
+                    skip='0.4cm'
+                ))
+                field_counter += 1
+
+        w(r'\vspace{0.3cm}' '\n\n')
+
+    w(r'\end{document}' '\n')
 
 
 def save_rtf_file(rtf_content: str, file_path: str) -> None:
@@ -342,105 +439,181 @@ def save_rtf_file(rtf_content: str, file_path: str) -> None:
 # LaTeX Generation Functions
 # ============================================================================
 
+# Write buffer size for LaTeX output files (1 MiB)
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# LaTeX special characters and their escaped forms. All characters are
+# replaced in a single pass, so the backslashes introduced by one
+# replacement are never escaped again by another. A regex scan is used
+# rather than str.translate, which is much slower on non-ASCII text.
+_LATEX_ESCAPES = {
+    '&': r'\&',
+    '%': r'\%',
+    '$': r'\$',
+    '#': r'\#',
+    '_': r'\_',
+    '{': r'\{',
+    '}': r'\}',
+    '~': r'\textasciitilde{}',
+    '^': r'\textasciicircum{}',
+    '\\': r'\textbackslash{}',
+}
+_LATEX_SPECIALS_RE = re.compile('[' + re.escape(''.join(_LATEX_ESCAPES)) + ']')
+
+
+@functools.lru_cache(maxsize=4096)
 def escape_latex(text: str) -> str:
     """
     Escape special characters for LaTeX.
 
+    Results are memoized, since the same headers and items are escaped
+    again for every role a script is generated for.
+
     Args:
         text: Plain text string
 
     Returns:
         LaTeX-escaped string
     """
-    replacements = {
-        '&': r'\&',
-        '%': r'\%',
-        '$': r'\$',
-        '#': r'\#',
-        '_': r'\_',
-        '{': r'\{',
-        '}': r'\}',
-        '~': r'\textasciitilde{}',
-        '^': r'\textasciicircum{}',
-        '\\': r'\textbackslash{}',
-    }
-
-    result = text
-    for char, escaped in replacements.items():
-        result = result.replace(char, escaped)
-
-    return result
-
-
-def generate_latex_skills(parsed_data: Dict[str, Any]) -> str:
+    # Most questions and skills have nothing to escape
+    if _LATEX_SPECIALS_RE.search(text) is None:
+        return text
+
+    return _LATEX_SPECIALS_RE.sub(lambda m: _LATEX_ESCAPES[m.group()], text)
+
+
+# Preamble and first-page header of the skills assessment
+_SKILLS_PREAMBLE = (
+    r'\documentclass[9pt,a4paper]{article}' '\n'
+    r'\usepackage[top=0.8in, bottom=0.8in, left=1in, right=1in]{geometry}' '\n'
+    r'\usepackage{array}' '\n'
+    r'\usepackage{amssymb}' '\n'
+    r'\usepackage{pifont}' '\n'
+    r'\usepackage{tikz}' '\n'
+    r'\usepackage{hyperref}' '\n'
+    r'\pagestyle{empty}' '\n'
+    '\n'
+    r'% Define rating and checkbox commands as clickable form fields' '\n'
+    r'% Rating squares: each gets unique name for independent clicking' '\n'
+    r'\newcommand{\ratingcircle}[2]{%' '\n'
+    r'  \raisebox{-0ex}{\CheckBox[name=#1_#2,width=1.2ex,height=1.2ex,bordercolor={0 0 0},borderstyle=S,borderwidth=1]{}}%' '\n'
+    r'}' '\n'
+    r'% Target checkbox - static empty circle (no clicking behavior needed)' '\n'
+    r'\newcommand{\checkbox}[1]{\raisebox{-0.6ex}{\tikz\draw[very thick] (0,0) circle (1.2ex);}}' '\n'
+    r'\setlength{\parskip}{0pt}' '\n'
+    r'\setlength{\parindent}{0pt}' '\n'
+    '\n'
+    r'\begin{document}' '\n'
+    '\n'
+    r'\begin{center}' '\n'
+    r'{\Large\bfseries Assessment of skills for next year planning}' '\n'
+    r'\end{center}' '\n'
+    '\n'
+    r'\vspace{0.2cm}' '\n'
+    '\n'
+    r'% Header with labels - 4-column with explicit spacing: text | ability (5 boxes) | importance (3 boxes) | target checkbox' '\n'
+    r'\noindent' '\n'
+    r'\begin{tabular}{@{}p{\dimexpr\textwidth-2.4cm-1.3cm-1cm-3.5em-10pt\relax}' '\n'
+    r'                @{\hspace{1em}}>{\centering\arraybackslash}p{2.4cm}' '\n'
+    r'                @{\hspace{2.5em}}>{\centering\arraybackslash}p{1.3cm}' '\n'
+    r'                @{\hspace{1em}}>{\centering\arraybackslash}p{1cm}@{}}' '\n'
+    r'	& {\small current ability } & {\small priority} & \\' '\n'
+    r'	& \begin{tabular*}{2.4cm}{@{}l@{\extracolsep{\fill}}r@{}}' '\n'
+    r'    \small poor & \small great' '\n'
+    r'  \end{tabular*}' '\n'
+    r'  & \begin{tabular*}{1.3cm}{@{}l@{\extracolsep{\fill}}r@{}}' '\n'
+    r'    \small low & \small high' '\n'
+    r'  \end{tabular*} & {\small target} \\' '\n'
+    r'\end{tabular}' '\n'
+    '\n'
+    '\n'
+    '\n'
+    r'\vspace{-2em}' '\n'
+    '\n'
+    r'{\small \textcolor{gray}{(Check the back page for instructions)}}' '\n'
+    '\n'
+    r'\vspace{1em}' '\n'
+)
+
+# Instructions on the back page of the skills assessment
+_SKILLS_INSTRUCTIONS = (
+    r'\newpage' '\n'
+    '\n'
+    r'\section*{Instructions}' '\n'
+    '\n'
+    r'\noindent This document is designed to help you identify key transversal academic skills that you might want to strengthen during the next year. Fill it in with as much honesty as you can. You will revise it with your mentor afterwards, so do not worry too much about being objective---rather, try to write what is most representative of your current understanding. There will be plenty of opportunities to make amendments.' '\n'
+    '\n'
+    r'\vspace{0.5cm}' '\n'
+    '\n'
+    r'\noindent First, go through each of the items and use the first column of checkboxes to self-report your perceived degree of ability at each of them. Use the low end for an absolute lack of ability, and the high end for abilities that are as developed as you would like them to be at the end of your PhD. At this stage, ignore the other two columns.' '\n'
+    '\n'
+    r'\vspace{0.5cm}' '\n'
+    '\n'
+    r'\noindent Second, evaluate the priority of each of the skills, independently of your current level of ability. A skill is a priority when you deem it generally important and/or it is relevant for your current project. A skill that you do not think you will have use for in a mid-term horizon probably does not deserve a high priority.' '\n'
+    '\n'
+    r'\vspace{0.5cm}' '\n'
+    '\n'
+    r'\noindent Last, select a set of 2--10 skills you would like to target as learning objectives for the next year. Try to choose those for which you have low ability and high priority, but that also seem exciting to you at this point. Feel free to add additional skills that you deem important but are not included in this document.' '\n'
+    '\n'
+    r'\vspace{0.5cm}' '\n'
+    '\n'
+    r'\noindent Bring this list with you to the end-of-the-year meeting, where you will have the opportunity to revise and refine the list of priorities for the incoming year.' '\n'
+    '\n'
+)
+
+# Skill row: ability rating (5 squares), priority rating (3 squares) and
+# target circle, written with a single format call. The row itself is kept
+# on one line so that no stray spaces end up in the table cells.
+_SKILL_ROW_TMPL = (
+    r'\noindent\begin{{tabular}}{{@{{}}p{{\dimexpr\textwidth-2.4cm-1.3cm-1cm-3.5em-10pt\relax}}' '\n'
+    r'                @{{\hspace{{1em}}}}>{{\arraybackslash}}p{{2.4cm}}' '\n'
+    r'                @{{\hspace{{2.5em}}}}>{{\arraybackslash}}p{{1.3cm}}' '\n'
+    r'                @{{\hspace{{1em}}}}>{{\centering\arraybackslash}}p{{1cm}}@{{}}}}' '\n'
+    r'{text} & '
+    r'\begin{{tabular*}}{{2.4cm}}{{@{{}}c@{{\extracolsep{{\fill}}}}c@{{\extracolsep{{\fill}}}}c@{{\extracolsep{{\fill}}}}c@{{\extracolsep{{\fill}}}}c@{{}}}}'
+    r'\ratingcircle{{{name}_ability}}{{1}} & '
+    r'\ratingcircle{{{name}_ability}}{{2}} & '
+    r'\ratingcircle{{{name}_ability}}{{3}} & '
+    r'\ratingcircle{{{name}_ability}}{{4}} & '
+    r'\ratingcircle{{{name}_ability}}{{5}}'
+    r'\end{{tabular*}} & '
+    r'\begin{{tabular*}}{{1.3cm}}{{@{{}}c@{{\extracolsep{{\fill}}}}c@{{\extracolsep{{\fill}}}}c@{{}}}}'
+    r'\ratingcircle{{{name}_importance}}{{1}} & '
+    r'\ratingcircle{{{name}_importance}}{{2}} & '
+    r'\ratingcircle{{{name}_importance}}{{3}}'
+    r'\end{{tabular*}} & '
+    r'\checkbox{{{name}_target}}' '\n'
+    r'\end{{tabular}}\\[0.02cm]' '\n'
+)
+
+
+def generate_latex_skills(parsed_data: Dict[str, Any],
+                          out: Optional[TextIO] = None) -> Optional[str]:
     """
     Generate LaTeX document for skills assessment with rating squares and target circle.
 
     Args:
         parsed_data: Output from parse_markdown()
+        out: Optional text stream to write the document to. If omitted, the
+            document is built in memory and returned.
 
     Returns:
-        LaTeX document as string
-    """
-    latex_lines = [
-        r'\documentclass[9pt,a4paper]{article}',
-        r'\usepackage[top=0.8in, bottom=0.8in, left=1in, right=1in]{geometry}',
-        r'\usepackage{array}',
-        r'\usepackage{amssymb}',
-        r'\usepackage{pifont}',
-        r'\usepackage{tikz}',
-        r'\usepackage{hyperref}',
-        r'\pagestyle{empty}',
-        r'',
-        r'% Define rating and checkbox commands as clickable form fields',
-        r'% Rating squares: each gets unique name for independent clicking',
-        r'\newcommand{\ratingcircle}[2]{%',
-        r'  \raisebox{-0ex}{\CheckBox[name=#1_#2,width=1.2ex,height=1.2ex,bordercolor={0 0 0},borderstyle=S,borderwidth=1]{}}%',
-        r'}',
-        r'% Target checkbox - static empty circle (no clicking behavior needed)',
-        r'\newcommand{\checkbox}[1]{\raisebox{-0.6ex}{\tikz\draw[very thick] (0,0) circle (1.2ex);}}',
-        r'\setlength{\parskip}{0pt}',
-        r'\setlength{\parindent}{0pt}',
-        r'',
-        r'\begin{document}',
-        r'',
-        r'\begin{center}',
-        r'{\Large\bfseries Assessment of skills for next year planning}',
-        r'\end{center}',
-        r'',
-        r'\vspace{0.2cm}',
-        r'',
-        r'% Header with labels - 4-column with explicit spacing: text | ability (5 boxes) | importance (3 boxes) | target checkbox',
-        r'\noindent',
-        r'\begin{tabular}{@{}p{\dimexpr\textwidth-2.4cm-1.3cm-1cm-3.5em-10pt\relax}',
-        r'                @{\hspace{1em}}>{\centering\arraybackslash}p{2.4cm}',
-        r'                @{\hspace{2.5em}}>{\centering\arraybackslash}p{1.3cm}',
-        r'                @{\hspace{1em}}>{\centering\arraybackslash}p{1cm}@{}}',
-        r'	& {\small current ability } & {\small priority} & \\',
-        r'	& \begin{tabular*}{2.4cm}{@{}l@{\extracolsep{\fill}}r@{}}',
-        r'    \small poor & \small great',
-        r'  \end{tabular*}',
-        r'  & \begin{tabular*}{1.3cm}{@{}l@{\extracolsep{\fill}}r@{}}',
-        r'    \small low & \small high',
-        r'  \end{tabular*} & {\small target} \\',
-        r'\end{tabular}',
-        r'',
-        r'',
-        r'',
-        r'\vspace{-2em}',
-        r'',
-        r'{\small \textcolor{gray}{(Check the back page for instructions)}}',
-        r'',
-        r'\vspace{1em}',
-
-    ]
+        LaTeX document as string, or None if it was written to out
+    """
+    if out is None:
+        buffer = io.StringIO()
+        generate_latex_skills(parsed_data, buffer)
+        return buffer.getvalue()
+
+    w = out.write
+    w(_SKILLS_PREAMBLE)
 
     # Add sections
     skill_counter = 1
     for section in parsed_data['sections']:
         # Section header (bold)
         header = escape_latex(section['header'])
-        latex_lines.append(r'\noindent\textbf{' + header + r'}\\[0.1cm]')
+        w(rf'\noindent\textbf{{{header}}}\\[0.1cm]' '\n')
 
         # Get items - handle both old structure (direct items) and new structure (subsections)
         items = []
@@ -458,69 +631,31 @@ def generate_latex_skills(parsed_data: Dict[str, Any]) -> str:
             skill_name = f'skill{skill_counter}'
             skill_counter += 1
 
-            latex_lines.append(
-                r'\noindent\begin{tabular}{@{}p{\dimexpr\textwidth-2.4cm-1.3cm-1cm-3.5em-10pt\relax}'
-            )
-            latex_lines.append(
-                r'                @{\hspace{1em}}>{\arraybackslash}p{2.4cm}'
-            )
-            latex_lines.append(
-                r'                @{\hspace{2.5em}}>{\arraybackslash}p{1.3cm}'
-            )
-            latex_lines.append(
-                r'                @{\hspace{1em}}>{\centering\arraybackslash}p{1cm}@{}}'
-            )
+            w(_SKILL_ROW_TMPL.format(text=item_text, name=skill_name))
 
-            # Build the whole row in one go, no stray spaces
-            row = (
-                f'{item_text} & '
-                r'\begin{tabular*}{2.4cm}{@{}c@{\extracolsep{\fill}}c@{\extracolsep{\fill}}c@{\extracolsep{\fill}}c@{\extracolsep{\fill}}c@{}}'
-                + f'\\ratingcircle{{{skill_name}_ability}}{{1}} & '
-                + f'\\ratingcircle{{{skill_name}_ability}}{{2}} & '
-                + f'\\ratingcircle{{{skill_name}_ability}}{{3}} & '
-                + f'\\ratingcircle{{{skill_name}_ability}}{{4}} & '
-                + f'\\ratingcircle{{{skill_name}_ability}}{{5}}'
-                + r'\end{tabular*} & '
-                r'\begin{tabular*}{1.3cm}{@{}c@{\extracolsep{\fill}}c@{\extracolsep{\fill}}c@{}}'
-                + f'\\ratingcircle{{{skill_name}_importance}}{{1}} & '
-                + f'\\ratingcircle{{{skill_name}_importance}}{{2}} & '
-                + f'\\ratingcircle{{{skill_name}_importance}}{{3}}'
-                + r'\end{tabular*} & '
-                + f'\\checkbox{{{skill_name}_target}}'
-            )
-            latex_lines.append(row)
+        w('\n')
 
-            latex_lines.append(r'\end{tabular}\\[0.02cm]')
+    # Add instructions on second page
+    w(_SKILLS_INSTRUCTIONS)
 
-        latex_lines.append(r'')
+    w(r'\end{document}' '\n')
 
-    # Add instructions on second page
-    latex_lines.append(r'\newpage')
-    latex_lines.append(r'')
-    latex_lines.append(r'\section*{Instructions}')
-    latex_lines.append(r'')
-    latex_lines.append(r'\noindent This document is designed to help you identify key transversal academic skills that you might want to strengthen during the next year. Fill it in with as much honesty as you can. You will revise it with your mentor afterwards, so do not worry too much about being objective---rather, try to write what is most representative of your current understanding. There will be plenty of opportunities to make amendments.')
-    latex_lines.append(r'')
-    latex_lines.append(r'\vspace{0.5cm}')
-    latex_lines.append(r'')
-    latex_lines.append(r'\noindent First, go through each of the items and use the first column of checkboxes to self-report your perceived degree of ability at each of them. Use the low end for an absolute lack of ability, and the high end for abilities that are as developed as you would like them to be at the end of your PhD. At this stage, ignore the other two columns.')
-    latex_lines.append(r'')
-    latex_lines.append(r'\vspace{0.5cm}')
-    latex_lines.append(r'')
-    latex_lines.append(r'\noindent Second, evaluate the priority of each of the skills, independently of your current level of ability. A skill is a priority when you deem it generally important and/or it is relevant for your current project. A skill that you do not think you will have use for in a mid-term horizon probably does not deserve a high priority.')
-    latex_lines.append(r'')
-    latex_lines.append(r'\vspace{0.5cm}')
-    latex_lines.append(r'')
-    latex_lines.append(r'\noindent Last, select a set of 2--10 skills you would like to target as learning objectives for the next year. Try to choose those for which you have low ability and high priority, but that also seem exciting to you at this point. Feel free to add additional skills that you deem important but are not included in this document.')
-    latex_lines.append(r'')
-    latex_lines.append(r'\vspace{0.5cm}')
-    latex_lines.append(r'')
-    latex_lines.append(r'\noindent Bring this list with you to the end-of-the-year meeting, where you will have the opportunity to revise and refine the list of priorities for the incoming year.')
-    latex_lines.append(r'')
-
-    latex_lines.append(r'\end{document}')
-
-    return '\n'.join(latex_lines)
+
+def open_latex_file(file_path: str) -> TextIO:
+    """
+    Open a file for writing LaTeX content, e.g. as the out stream of the
+    generators.
+
+    The file uses a large write buffer, so the many small writes made by the
+    generators reach the disk in a few system calls when the file is closed.
+
+    Args:
+        file_path: Output file path
+
+    Returns:
+        Text stream open for writing
+    """
+    return open(file_path, 'w', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE)
 
 
 def save_latex_file(latex_content: str, file_path: str) -> None:
@@ -531,7 +666,7 @@ def save_latex_file(latex_content: str, file_path: str) -> None:
         latex_content: LaTeX document string
         file_path: Output file path
     """
-    with open(file_path, 'w', encoding='utf-8') as f:
+    with open_latex_file(file_path) as f:
         f.write(latex_content)
 
 
@@ -539,63 +674,505 @@ def save_latex_file(latex_content: str, file_path: str) -> None:
 # PDF Compilation Functions
 # ============================================================================
 
-def compile_latex_to_pdf(tex_path: str, output_pdf_path: str) -> bool:
+# Parent directory for pdflatex scratch directories: tmpfs when available
+_SCRATCH_ROOT = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+# Seconds after which building a preamble format that failed is retried,
+# e.g. because mylatexformat has been installed since
+_FORMAT_RETRY_SECONDS = 24 * 60 * 60
+
+# Number of PDFs kept in the PDF cache; the least recently used are evicted
+_PDF_CACHE_MAX_ENTRIES = 64
+
+# LaTeX commands whose output depends on a previous pass. This only decides
+# whether to start with a draft pass; reruns are detected after each pass.
+_CROSS_REF_RE = re.compile(
+    rb'\\(?:(?:eq|auto|page|name|c|C)?ref|cite|label|tableofcontents|listof\w*)\b'
+)
+
+# Files carrying information from one pdflatex pass to the next
+_RERUN_EXTENSIONS = ('.aux', '.toc', '.lof', '.lot', '.out')
+
+# Log messages with which LaTeX and packages ask for another pass
+_RERUN_LOG_RE = re.compile(rb'Rerun to get|may have changed\. Rerun|Rerun LaTeX')
+
+# Upper bound on final pdflatex passes, in case a document never converges
+_MAX_FINAL_PASSES = 2
+
+
+def _cache_dir() -> Optional[Path]:
+    """
+    Locate the directory where preamble formats and compiled PDFs are kept
+    across runs.
+
+    Returns:
+        Cache directory, or None if the home directory cannot be determined
+    """
+    cache_home = os.environ.get('XDG_CACHE_HOME')
+    if not cache_home:
+        try:
+            cache_home = Path.home() / '.cache'
+        except (RuntimeError, KeyError):
+            return None
+    return Path(cache_home) / 'endoy'
+
+
+def _file_digest(path: str) -> bytes:
+    """
+    Hash a file's contents, so that changes between passes can be detected.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        BLAKE2b digest of the file contents, empty for a missing or empty file
+    """
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return b''
+    return hashlib.blake2b(data).digest() if data else b''
+
+
+def _publish_to_cache(src: str, dest: Path) -> None:
+    """
+    Copy a file into the cache atomically.
+
+    Concurrent compilations may publish the same entry, and readers must
+    never see a partially written file.
+
+    Args:
+        src: File to copy
+        dest: Cache entry path
+    """
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    fd, partial = tempfile.mkstemp(dir=dest.parent, prefix=dest.name, suffix='.part')
+    os.close(fd)
+    try:
+        shutil.copyfile(src, partial)
+        os.replace(partial, dest)
+    except OSError:
+        os.unlink(partial)
+        raise
+
+
+def _prune_cache(cache_dir: Path, pattern: str, max_entries: int) -> None:
+    """
+    Evict the least recently used entries from a cache directory.
+
+    Args:
+        cache_dir: Cache directory
+        pattern: Glob pattern matching the cache entries
+        max_entries: Number of entries to keep
+    """
+    entries = []
+    for path in cache_dir.glob(pattern):
+        try:
+            entries.append((path.stat().st_mtime, path))
+        except FileNotFoundError:
+            pass  # Evicted concurrently
+
+    entries.sort(reverse=True)
+    for _, path in entries[max_entries:]:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+@functools.lru_cache(maxsize=1)
+def pdflatex_version() -> str:
+    """
+    Get the pdflatex version banner, which cached PDFs and format files are
+    tied to.
+
+    Returns:
+        First line of `pdflatex --version`
+    """
+    result = subprocess.run(
+        ['pdflatex', '--version'],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        timeout=30
+    )
+    return result.stdout.partition('\n')[0]
+
+
+def _record_inputs(fls_path: str) -> str:
+    """
+    List the files read by a pdflatex run, from its -recorder output.
+
+    Args:
+        fls_path: Path to the .fls file pdflatex wrote
+
+    Returns:
+        One "mtime_ns size path" line per file, for _inputs_unchanged().
+        Files in the scratch directory, given as relative paths, are left out.
+    """
+    lines = []
+    seen = set()
+    with open(fls_path, 'rb') as f:
+        for line in f:
+            if not line.startswith(b'INPUT '):
+                continue
+            path = os.fsdecode(line[6:].rstrip(b'\r\n'))
+            if not os.path.isabs(path) or path in seen:
+                continue
+            seen.add(path)
+            st = os.stat(path)
+            lines.append(f'{st.st_mtime_ns} {st.st_size} {path}\n')
+    return ''.join(lines)
+
+
+def _inputs_unchanged(deps_path: Path) -> bool:
+    """
+    Check that the files recorded by _record_inputs() have not changed.
+
+    Args:
+        deps_path: File holding the output of _record_inputs()
+
+    Returns:
+        True if every file still has its recorded size and modification time
+    """
+    try:
+        with open(deps_path, 'r', encoding='utf-8', errors='surrogateescape') as f:
+            for line in f:
+                mtime_ns, size, path = line.rstrip('\n').split(' ', 2)
+                st = os.stat(path)
+                if st.st_mtime_ns != int(mtime_ns) or st.st_size != int(size):
+                    return False
+    except (OSError, ValueError):
+        return False
+    return True
+
+
+def _preamble_format(latex_content: bytes, tex_file: str, work_dir: str,
+                     env: Dict[str, str], cache_dir: Path) -> Optional[str]:
+    """
+    Get a precompiled format containing the document's preamble.
+
+    Loading the packages of the preamble dominates pdflatex start-up for
+    short documents. The preamble is dumped once into a format file with
+    mylatexformat and cached by its content, so later runs skip it. The
+    files it read (packages, local .sty files, \\input files) are recorded
+    next to the format, which is rebuilt when any of them changes.
+
+    Args:
+        latex_content: LaTeX document, as read from the .tex file
+        tex_file: Name of the .tex file in work_dir
+        work_dir: Directory pdflatex runs in
+        env: Environment for pdflatex
+        cache_dir: Directory the format is kept in, see _cache_dir()
+
+    Returns:
+        Format name to pass to -fmt, or None if no format could be built
+        (e.g. mylatexformat is not installed). Failures are remembered for
+        _FORMAT_RETRY_SECONDS; delete the cache directory to retry sooner.
+    """
+    preamble, begin, _ = latex_content.partition(rb'\begin{document}')
+    if not begin:
+        return None
+
+    try:
+        key = hashlib.blake2b(
+            pdflatex_version().encode('utf-8') + b'\n' + preamble,
+            digest_size=16
+        ).hexdigest()
+        fmt_name = f'endoy-{key}'
+        fmt_path = cache_dir / (fmt_name + '.fmt')
+        deps_path = fmt_path.with_suffix('.deps')
+        failed_marker = fmt_path.with_suffix('.failed')
+
+        if (failed_marker.exists()
+                and time.time() - failed_marker.stat().st_mtime < _FORMAT_RETRY_SECONDS):
+            return None
+
+        if not fmt_path.exists() or not _inputs_unchanged(deps_path):
+            subprocess.run(
+                ['pdflatex', '-ini', f'-jobname={fmt_name}', '-no-shell-escape',
+                 '-recorder', '-interaction=batchmode',
+                 '&pdflatex', 'mylatexformat.ltx', tex_file],
+                cwd=work_dir,
+                env=env,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=60
+            )
+            cache_dir.mkdir(parents=True, exist_ok=True)
+
+            # Remember failures so that they are not retried on every run
+            built = os.path.join(work_dir, fmt_name + '.fmt')
+            if not os.path.exists(built):
+                failed_marker.touch()
+                return None
+
+            built_deps = os.path.join(work_dir, fmt_name + '.deps')
+            with open(built_deps, 'w', encoding='utf-8', errors='surrogateescape') as f:
+                f.write(_record_inputs(os.path.join(work_dir, fmt_name + '.fls')))
+
+            _publish_to_cache(built, fmt_path)
+            _publish_to_cache(built_deps, deps_path)
+            if failed_marker.exists():
+                failed_marker.unlink()
+
+        return fmt_name
+
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _log_errors(log_path: str) -> str:
+    """
+    Extract the error messages from a pdflatex log file.
+
+    pdflatex output is discarded while compiling, so this is how a failure
+    gets reported. Errors start with "!" and are followed, a few lines
+    later, by the offending source line.
+
+    Args:
+        log_path: Path to the .log file pdflatex wrote
+
+    Returns:
+        Error lines joined by newlines, or an empty string if there are none
+    """
+    try:
+        with open(log_path, 'r', encoding='utf-8', errors='replace') as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return ''
+
+    # The source line follows the help text and context of the error
+    errors = []
+    for i, line in enumerate(lines):
+        if line.startswith('!'):
+            errors.append(line)
+            for following in lines[i + 1:]:
+                if following.startswith('l.'):
+                    errors.append(following)
+                    break
+                if following.startswith('!'):
+                    break
+    return '\n'.join(errors)
+
+
+def _log_requests_rerun(log_path: str) -> bool:
+    """
+    Check whether a pdflatex log asks for another pass.
+
+    Args:
+        log_path: Path to the .log file pdflatex wrote
+
+    Returns:
+        True if LaTeX or a package requested a rerun
+    """
+    try:
+        with open(log_path, 'rb') as f:
+            return _RERUN_LOG_RE.search(f.read()) is not None
+    except OSError:
+        return False
+
+
+def _run_pdflatex_passes(tex_file: str, work_dir: str, env: Dict[str, str],
+                         fmt_args: List[str],
+                         needs_draft_pass: bool) -> subprocess.CompletedProcess:
+    """
+    Run the pdflatex passes needed to produce a PDF.
+
+    Args:
+        tex_file: Name of the .tex file in work_dir
+        work_dir: Directory pdflatex runs in
+        env: Environment for pdflatex
+        fmt_args: Extra arguments selecting a format, if any
+        needs_draft_pass: Whether to start with a draft pass, for documents
+            known to have cross-references
+
+    Returns:
+        Result of the last pdflatex run
+    """
+    # A first pass is only needed to resolve cross-references. It runs in
+    # draft mode, which writes the .aux file but skips PDF generation.
+    if needs_draft_pass:
+        subprocess.run(
+            ['pdflatex', *fmt_args, '-interaction=batchmode', '-halt-on-error',
+             '-draftmode', '-no-shell-escape', tex_file],
+            cwd=work_dir,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=30
+        )
+
+    # Final pass producing the PDF, repeated while LaTeX asks for a rerun or
+    # the pass changed the auxiliary files the next pass would read.
+    # Batch mode keeps pdflatex from writing its transcript to the terminal;
+    # it is still written to the .log file.
+    base_name = os.path.splitext(tex_file)[0]
+    rerun_files = [os.path.join(work_dir, base_name + ext) for ext in _RERUN_EXTENSIONS]
+    log_file = os.path.join(work_dir, base_name + '.log')
+    for final_pass in range(_MAX_FINAL_PASSES):
+        digests = [_file_digest(path) for path in rerun_files]
+        result = subprocess.run(
+            ['pdflatex', *fmt_args, '-interaction=batchmode', '-no-shell-escape', tex_file],
+            cwd=work_dir,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=30
+        )
+        changed = [_file_digest(path) != digest
+                   for path, digest in zip(rerun_files, digests)]
+        # Every pass writes a .aux file, so when no earlier pass wrote one
+        # its appearance means nothing; labels in it make LaTeX log a rerun
+        # request instead.
+        if final_pass == 0 and not needs_draft_pass:
+            changed[0] = False
+        if not any(changed) and not _log_requests_rerun(log_file):
+            break
+
+    return result
+
+
+def compile_latex_to_pdf(tex_path: str, output_pdf_path: str,
+                         use_format_cache: bool = False,
+                         use_pdf_cache: bool = False) -> bool:
     """
     Compile LaTeX file to PDF using pdflatex.
 
+    pdflatex runs in a private scratch directory (on tmpfs when available),
+    so auxiliary files never touch the source directory and concurrent
+    compilations do not interfere. Only the final PDF is moved out.
+
     Args:
         tex_path: Path to .tex file
         output_pdf_path: Desired path for output PDF
+        use_format_cache: Compile against a cached format with the
+            preamble precompiled, when mylatexformat is available. Off by
+            default, as form fields set up by hyperref have not been
+            verified to work from a dumped format.
+        use_pdf_cache: Reuse the PDF from an earlier compilation of an
+            identical .tex file. The cache key only covers the .tex file
+            itself, so only enable this for self-contained documents that
+            do not \\input files or include images.
 
     Returns:
         True if successful, False otherwise
     """
+    # Read the source as bytes: pdflatex does not require it to be UTF-8
+    try:
+        with open(tex_path, 'rb') as f:
+            latex_content = f.read()
+    except OSError as e:
+        print(f"Cannot read LaTeX source {tex_path}: {e}")
+        return False
+
     try:
         # Get directory of tex file
         tex_dir = os.path.dirname(os.path.abspath(tex_path))
         tex_file = os.path.basename(tex_path)
-
-        # Run pdflatex twice (for proper formatting)
-        for _ in range(2):
-            result = subprocess.run(
-                ['pdflatex', '-interaction=nonstopmode', tex_file],
-                cwd=tex_dir,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-
-        # Check if PDF was actually generated (more reliable than return code)
-        generated_pdf = os.path.join(tex_dir, tex_file.replace('.tex', '.pdf'))
-
-        if not os.path.exists(generated_pdf):
-            print(f"pdflatex failed to generate PDF")
-            if result.returncode != 0:
-                print(f"pdflatex error: {result.stderr}")
-            return False
-
-        # Move/copy PDF to desired location if different
-
-        if generated_pdf != output_pdf_path:
-            import shutil
+        base_name = os.path.splitext(tex_file)[0]
+
+        cache_dir = _cache_dir() if use_pdf_cache or use_format_cache else None
+
+        # The same source compiled by the same pdflatex gives the same PDF
+        cached_pdf = None
+        if use_pdf_cache and cache_dir is not None:
+            key = hashlib.blake2b(
+                pdflatex_version().encode('utf-8') + b'\n' + latex_content,
+                digest_size=16
+            ).hexdigest()
+            cached_pdf = cache_dir / 'pdf' / f'{key}.pdf'
+            if cached_pdf.exists():
+                shutil.copyfile(cached_pdf, output_pdf_path)
+                try:
+                    cached_pdf.touch()  # Mark as recently used
+                except OSError:
+                    pass
+                return True
+
+        # Documents with cross-references start with a draft pass
+        needs_draft_pass = _CROSS_REF_RE.search(latex_content) is not None
+
+        # Let \input and friends still find files next to the source
+        env = dict(os.environ)
+        env['TEXINPUTS'] = tex_dir + os.pathsep + env.get('TEXINPUTS', '')
+
+        with tempfile.TemporaryDirectory(prefix='endoy-', dir=_SCRATCH_ROOT) as work_dir:
+            shutil.copyfile(tex_path, os.path.join(work_dir, tex_file))
+
+            fmt_args = []
+            if use_format_cache and cache_dir is not None:
+                fmt_name = _preamble_format(latex_content, tex_file, work_dir, env, cache_dir)
+                if fmt_name is not None:
+                    # Let pdflatex find the cached preamble format
+                    env['TEXFORMATS'] = str(cache_dir) + os.pathsep + env.get('TEXFORMATS', '')
+                    fmt_args = [f'-fmt={fmt_name}']
+
+            result = _run_pdflatex_passes(tex_file, work_dir, env, fmt_args, needs_draft_pass)
+
+            # Check if PDF was actually generated (more reliable than return code)
+            generated_pdf = os.path.join(work_dir, base_name + '.pdf')
+
+            # A preamble format that does not work for this document should
+            # not prevent it from compiling
+            if not os.path.exists(generated_pdf) and fmt_args:
+                result = _run_pdflatex_passes(tex_file, work_dir, env, [], needs_draft_pass)
+
+            if not os.path.exists(generated_pdf):
+                print(f"pdflatex failed to generate PDF for {tex_file}")
+                if result.returncode != 0:
+                    errors = _log_errors(os.path.join(work_dir, base_name + '.log'))
+                    print(f"pdflatex error in {tex_file}: {errors or 'see pdflatex log'}")
+                return False
+
+            if cached_pdf is not None:
+                try:
+                    _publish_to_cache(generated_pdf, cached_pdf)
+                    _prune_cache(cached_pdf.parent, '*.pdf', _PDF_CACHE_MAX_ENTRIES)
+                except OSError:
+                    pass  # Caching is best effort
+
+            # Move the PDF out; the scratch directory and all auxiliary
+            # files are removed with it
             shutil.move(generated_pdf, output_pdf_path)
 
-        # Clean up auxiliary files
-        base_name = tex_file.replace('.tex', '')
-        aux_extensions = ['.aux', '.log', '.out']
-        for ext in aux_extensions:
-            aux_file = os.path.join(tex_dir, base_name + ext)
-            if os.path.exists(aux_file):
-                os.remove(aux_file)
-
         return True
 
     except subprocess.TimeoutExpired:
-        print("pdflatex compilation timed out")
+        print(f"pdflatex compilation of {tex_path} timed out")
         return False
-    except FileNotFoundError:
+    except FileNotFoundError as e:
+        if e.filename != 'pdflatex':
+            print(f"Error during PDF compilation: {e}")
+            return False
         print("pdflatex not found. Please install TeX Live or similar LaTeX distribution.")
         return False
     except Exception as e:
         print(f"Error during PDF compilation: {e}")
-        return False
\ No newline at end of file
+        return False
+
+
+def compile_latex_to_pdf_batch(jobs: List[Tuple[str, str]],
+                               max_workers: Optional[int] = None) -> List[bool]:
+    """
+    Compile several LaTeX files to PDF concurrently.
+
+    Each compilation runs pdflatex in its own scratch directory, so
+    independent documents can be compiled in parallel. Threads are enough,
+    as the work happens in pdflatex subprocesses.
+
+    Args:
+        jobs: (tex_path, output_pdf_path) pairs, see compile_latex_to_pdf()
+        max_workers: Maximum number of concurrent pdflatex runs; defaults to
+            the number of CPUs
+
+    Returns:
+        For each job, in order, True if successful, False otherwise
+    """
+    if not jobs:
+        return []
+
+    workers = min(len(jobs), max_workers or os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda job: compile_latex_to_pdf(*job), jobs))